@@ -3,6 +3,8 @@ import sys
 import os
 import glob
 
+import numpy as np
+
 try:
     import mne
 except ImportError:
@@ -12,10 +14,14 @@ except ImportError:
 CHANNELS_PER_BLOCK = 8
 BITS_PER_SAMPLE    = 16
 MAX_SAMPLES        = 65535
+LIST_FILES         = 5
 
-def to_int16(v, max_val):
-    scaled = int(v / max_val * 32767) if max_val != 0 else 0
-    return max(-32768, min(32767, scaled)) & 0xFFFF
+def to_int16(block, max_val):
+    """Scale a (channels, samples) block to 16-bit two's-complement codes."""
+    if max_val == 0:
+        return np.zeros(block.shape, dtype=np.int64)
+    scaled = np.trunc(block / max_val * 32767)
+    return np.clip(scaled, -32768, 32767).astype(np.int64) & 0xFFFF
 
 def process_edf(edf_path, out_file, blocks_written, max_blocks):
     """Read one .edf file and append its blocks to out_file. Returns new block count."""
@@ -32,17 +38,20 @@ def process_edf(edf_path, out_file, blocks_written, max_blocks):
 
     max_val = max(abs(data.max()), abs(data.min()), 1e-12)
 
-    for t in range(n_times):
-        if blocks_written >= max_blocks:
-            return blocks_written, (n_channels, sfreq)
-        word = 0
-        for ch in range(CHANNELS_PER_BLOCK):
-            sample = to_int16(data[ch, t], max_val) if ch < n_channels else 0
-            word   = (word << 16) | sample
-        out_file.write(f"{word:032X}\n")
-        blocks_written += 1
+    # Quantize every block this file contributes in one pass; channels past
+    # n_channels stay zero.
+    n_blocks = max(0, min(n_times, max_blocks - blocks_written))
+    n_used   = min(n_channels, CHANNELS_PER_BLOCK)
+    samples  = np.zeros((CHANNELS_PER_BLOCK, n_blocks), dtype=np.int64)
+    samples[:n_used] = to_int16(data[:n_used, :n_blocks], max_val)
+
+    # One 128-bit word per time step, channel 0 in the top 16 bits: pack the
+    # (time, channel) grid big-endian and let bytes.hex() split every 16 bytes.
+    if n_blocks:
+        rows = samples.T.astype(">u2").tobytes()
+        out_file.write(rows.hex("\n", 16).upper() + "\n")
 
-    return blocks_written, (n_channels, sfreq)
+    return blocks_written + n_blocks, (n_channels, sfreq)
 
 def main():
     if len(sys.argv) < 2:
@@ -62,8 +71,11 @@ def main():
             print(f"ERROR: No .edf files found in {input_path}")
             sys.exit(1)
         print(f"Found {len(edf_files)} .edf files:")
-        for f in edf_files:
+        # A full PhysioNet tree has >1500 files; list only the first few.
+        for f in edf_files[:LIST_FILES]:
             print(f"  {f}")
+        if len(edf_files) > LIST_FILES:
+            print(f"  ... and {len(edf_files) - LIST_FILES} more")
     elif os.path.isfile(input_path) and input_path.endswith(".edf"):
         edf_files = [input_path]
     else:
@@ -95,32 +107,34 @@ def main():
 
     # ── Write info file ───────────────────────────────────────────────────────
     with open(info_path, "w") as f:
-        f.write("===== Paste these values into eeg_dataset_config.sv =====\n\n")
-        f.write(f"parameter DATASET_DEPTH = {blocks_written};\n\n")
-        f.write(f"localparam NUM_CHANNELS    = {n_channels};\n")
-        f.write(f"localparam SAMPLE_RATE     = {sfreq};\n")
-        f.write(f"localparam BITS_PER_SAMPLE = {BITS_PER_SAMPLE};\n\n")
-        f.write(f"// Uncomment in initial block:\n")
-        f.write(f'// $readmemh("data/dataset.hex", dataset_memory);\n\n')
-        f.write(f"// Source folder: {input_path}\n")
-        f.write(f"// Files processed: {len(edf_files)}\n")
-        f.write(f"// Total blocks: {blocks_written}\n")
+        f.write(
+            "===== Paste these values into eeg_dataset_config.sv =====\n\n"
+            f"parameter DATASET_DEPTH = {blocks_written};\n\n"
+            f"localparam NUM_CHANNELS    = {n_channels};\n"
+            f"localparam SAMPLE_RATE     = {sfreq};\n"
+            f"localparam BITS_PER_SAMPLE = {BITS_PER_SAMPLE};\n\n"
+            "// Uncomment in initial block:\n"
+            '// $readmemh("data/dataset.hex", dataset_memory);\n\n'
+            f"// Source folder: {input_path}\n"
+            f"// Files processed: {len(edf_files)}\n"
+            f"// Total blocks: {blocks_written}\n"
+        )
 
     # ── Summary ───────────────────────────────────────────────────────────────
-    print()
-    print("=" * 60)
-    print("DONE. Paste these into eeg_dataset_config.sv:")
-    print("=" * 60)
-    print(f"  parameter DATASET_DEPTH    = {blocks_written};")
-    print(f"  localparam NUM_CHANNELS    = {n_channels};")
-    print(f"  localparam SAMPLE_RATE     = {sfreq};")
-    print(f"  localparam BITS_PER_SAMPLE = {BITS_PER_SAMPLE};")
-    print()
-    print("And uncomment this line in the initial block:")
-    print('  $readmemh("data/dataset.hex", dataset_memory);')
-    print()
-    print(f"Full details: {info_path}")
-    print("=" * 60)
+    rule = "=" * 60
+    print(
+        f"\n{rule}\n"
+        "DONE. Paste these into eeg_dataset_config.sv:\n"
+        f"{rule}\n"
+        f"  parameter DATASET_DEPTH    = {blocks_written};\n"
+        f"  localparam NUM_CHANNELS    = {n_channels};\n"
+        f"  localparam SAMPLE_RATE     = {sfreq};\n"
+        f"  localparam BITS_PER_SAMPLE = {BITS_PER_SAMPLE};\n\n"
+        "And uncomment this line in the initial block:\n"
+        '  $readmemh("data/dataset.hex", dataset_memory);\n\n'
+        f"Full details: {info_path}\n"
+        f"{rule}"
+    )
 
 if __name__ == "__main__":
     main()
@@ -68,7 +68,7 @@ def main() -> int:
     bin_center_q = -(np.arange(N) * codes_per_entry + codes_per_entry // 2).astype(np.int64)
     bin_center_real = bin_center_q.astype(np.float64) / scale          # negative
 
-    elu_real = alpha * (np.exp(bin_center_real) - 1.0)
+    elu_real = alpha * np.expm1(bin_center_real)
     elu_q = np.round(elu_real * scale).astype(np.int64)
     hi = (1 << (DATA_WIDTH - 1)) - 1
     lo = -(1 << (DATA_WIDTH - 1))
@@ -81,9 +81,7 @@ def main() -> int:
     out_path = OUT_DIR / LUT_NAME
     mask = (1 << DATA_WIDTH) - 1
     digits = (DATA_WIDTH + 3) // 4
-    with out_path.open("w") as f:
-        for v in elu_q:
-            f.write(f"{int(v) & mask:0{digits}X}\n")
+    out_path.write_text("".join(f"{v & mask:0{digits}X}\n" for v in elu_q.tolist()))
     print(f"wrote {out_path}  ({N} entries)")
 
     meta_path = OUT_DIR / "elu_q88_meta.txt"
@@ -93,9 +93,7 @@ def main() -> int:
     out_path = OUT_DIR / LUT_NAME
     mask = (1 << DATA_WIDTH) - 1
     digits = (DATA_WIDTH + 3) // 4
-    with out_path.open("w") as f:
-        for v in sig_q:
-            f.write(f"{int(v) & mask:0{digits}X}\n")
+    out_path.write_text("".join(f"{v & mask:0{digits}X}\n" for v in sig_q.tolist()))
     print(f"wrote {out_path}  ({N} entries)")
 
     # Also emit metadata so q88_*.py scripts and RTL agree on the address mapping.
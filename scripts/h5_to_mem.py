@@ -67,22 +67,21 @@ def quantize_q(arr: np.ndarray, frac_bits: int, width: int) -> np.ndarray:
     hi = (1 << (width - 1)) - 1
     lo = -(1 << (width - 1))
     q = np.round(arr * scale).astype(np.int64)
-    q = np.clip(q, lo, hi).astype(np.int32)
+    # Store in the narrowest signed type that holds the word (int16 for Q8.8).
+    q = np.clip(q, lo, hi).astype(np.int16 if width <= 16 else np.int32)
     return q
 
 
 def to_uint16_two_complement(q: np.ndarray, width: int) -> np.ndarray:
     """View signed q-values as unsigned bit patterns (two's complement)."""
     mask = (1 << width) - 1
-    return (q.astype(np.int64) & mask).astype(np.uint64)
+    return (q.astype(np.int64) & mask).astype(np.uint16 if width <= 16 else np.uint64)
 
 
 def emit_mem(out_path: Path, q: np.ndarray, width: int) -> None:
-    u = to_uint16_two_complement(q.flatten(), width)
+    u = to_uint16_two_complement(q.ravel(), width)
     digits = (width + 3) // 4
-    with out_path.open("w") as f:
-        for v in u:
-            f.write(f"{int(v):0{digits}X}\n")
+    out_path.write_text("".join(f"{v:0{digits}X}\n" for v in u.tolist()))
 
 
 def collect_layer_vars(group: h5py.Group, prefix: str = "layers"):
@@ -139,7 +138,7 @@ def main() -> int:
         for layer_name, entries in per_layer_vars.items():
             roles = role_names_for(layer_name, len(entries))
             for (vk, ds), role in zip(entries, roles):
-                arr = ds[()].astype(np.float32)
+                arr = ds[()].astype(np.float32, copy=False)
                 if arr.size == 0:
                     if args.skip_empty:
                         n_skipped += 1
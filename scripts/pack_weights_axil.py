@@ -35,11 +35,9 @@ def pack_section(entries: list[int]) -> bytes:
     # Pad to even length.
     if len(entries) % 2:
         entries = entries + [0]
-    out = bytearray()
-    for i in range(0, len(entries), 2):
-        word = (entries[i + 1] << 16) | entries[i]
-        out += struct.pack("<I", word & 0xFFFFFFFF)
-    return bytes(out)
+    # A little-endian word (hi << 16) | lo is just lo then hi as two
+    # little-endian halfwords, so pack the whole section in one call.
+    return struct.pack(f"<{len(entries)}H", *entries)
 
 
 def main() -> int:
@@ -81,10 +79,11 @@ def main() -> int:
     out_idx  = 0
     print(f"Packing {len(sections)} sections...")
     for name, base, hex_path in sections:
-        if not hex_path.exists():
+        try:
+            entries = load_q88_hex(hex_path)
+        except FileNotFoundError:
             print(f"  WARN: skipping {name} (missing {hex_path})")
             continue
-        entries = load_q88_hex(hex_path)
         packed  = pack_section(entries)
         len_w   = len(packed) // 4
         print(f"  {name:24s} base=0x{base:08x}  entries={len(entries):>6d}  words={len_w:>5d}")
@@ -32,6 +32,7 @@ Artifacts written to data/golden_q88/:
 from __future__ import annotations
 
 import json
+import shutil
 from pathlib import Path
 
 import h5py
@@ -48,6 +49,10 @@ COEF_WIDTH = 16
 FRAC_BITS  = 8
 ACC_WIDTH  = 48
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 T   = 600
 C   = 5
 F1  = 16
@@ -75,44 +80,37 @@ LUT_SHIFT   = 3
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
 
 def elu_q88_lut(x_q88: np.ndarray, lut: np.ndarray) -> np.ndarray:
-    out = x_q88.copy().astype(np.int32)
+    out = x_q88.astype(np.int32)
     neg_mask = x_q88 < 0
     neg_vals = x_q88[neg_mask]
     addr = ((-neg_vals.astype(np.int64)) >> LUT_SHIFT).astype(np.int64)
     addr = np.clip(addr, 0, LUT_N - 1)
     out[neg_mask] = lut[addr]
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     return np.clip(out, LO, HI).astype(np.int16)
 
 
@@ -123,8 +121,6 @@ def avg_pool_q88(x_q: np.ndarray, pool: int, inv_pool: int) -> np.ndarray:
     grouped = x_q[:T_full].astype(np.int64).reshape(-1, pool, x_q.shape[1])
     sums = grouped.sum(axis=1)
     y = (sums * inv_pool) >> Q_SHIFT
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     return np.clip(y, LO, HI).astype(np.int16)
 
 
@@ -162,13 +158,11 @@ def main() -> int:
     acc = np.einsum('tcf, cfd -> tfd', x_q.astype(np.int64), qw_dwise.astype(np.int64))
     shifted   = acc >> FRAC_BITS
     with_bias = shifted + qb_dwise[np.newaxis, :, :].astype(np.int64)
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     dwise_out = np.clip(with_bias, LO, HI).astype(np.int16).reshape(T, F2_B)
     print(f"  output (T,F2_B)={dwise_out.shape}, abs_max={int(np.abs(dwise_out).max())}, "
           f"sat={int(((with_bias > HI) | (with_bias < LO)).sum())}/{with_bias.size}")
     qw_flat = qw_dwise.reshape(C, F2_B)                                # i = f*D + d
-    (OUT_DIR / "stage_branchB_dwise_input.hex").write_text(Path(ECA1_OUT_HEX).read_text())
+    shutil.copyfile(ECA1_OUT_HEX, OUT_DIR / "stage_branchB_dwise_input.hex")
     (OUT_DIR / "stage_branchB_dwise_weights.hex").write_text(to_hex(qw_flat, COEF_WIDTH))
     (OUT_DIR / "stage_branchB_dwise_bias.hex").write_text(to_hex(qb_dwise.reshape(F2_B), DATA_WIDTH))
     (OUT_DIR / "stage_branchB_dwise_output.hex").write_text(to_hex(dwise_out, DATA_WIDTH))
@@ -185,7 +179,8 @@ def main() -> int:
     print("\n=== Layer 12: AvgPool(8,1) → (75, 64) ===")
     pool1_out = avg_pool_q88(elu1_out, POOL1, INV_POOL1)
     print(f"  output shape={pool1_out.shape}, abs_max={int(np.abs(pool1_out).max())}")
-    (OUT_DIR / "stage_branchB_pool1_output.hex").write_text(to_hex(pool1_out, DATA_WIDTH))
+    pool1_hex = to_hex(pool1_out, DATA_WIDTH)
+    (OUT_DIR / "stage_branchB_pool1_output.hex").write_text(pool1_hex)
 
     # ===== Layer 13: separable Conv2D + BN_4 folded =====
     print("\n=== Layer 13: Branch B separable Conv2D (F_IN=64) + BN_4 folded ===")
@@ -197,18 +192,14 @@ def main() -> int:
     pad_top = (KE_SEP - 1) // 2     # 7
     x_padded = np.zeros((T_POOL + KE_SEP - 1, F_SEP_IN), dtype=np.int64)
     x_padded[pad_top : pad_top + T_POOL] = pool1_out.astype(np.int64)
-    acc = np.zeros((T_POOL, F_SEP_OUT), dtype=np.int64)
-    for k in range(KE_SEP):
-        acc += np.einsum('ti, ij -> tj',
-                         x_padded[k : k + T_POOL].astype(np.int64),
-                         qw_sep[k].astype(np.int64))
+    rows = np.arange(T_POOL)[:, np.newaxis] + np.arange(KE_SEP)[np.newaxis, :]
+    acc = np.tensordot(x_padded[rows], qw_sep.astype(np.int64), axes=([1, 2], [0, 1]))
     shifted   = acc >> FRAC_BITS
     with_bias = shifted + qb_sep[np.newaxis, :].astype(np.int64)
     sep_out = np.clip(with_bias, LO, HI).astype(np.int16)               # (T_POOL, F_OUT)
     print(f"  output {sep_out.shape}, abs_max={int(np.abs(sep_out).max())}, "
           f"sat={int(((with_bias > HI) | (with_bias < LO)).sum())}/{with_bias.size}")
-    (OUT_DIR / "stage_branchB_sep_input.hex").write_text(
-        (OUT_DIR / "stage_branchB_pool1_output.hex").read_text())
+    (OUT_DIR / "stage_branchB_sep_input.hex").write_text(pool1_hex)
     (OUT_DIR / "stage_branchB_sep_weights.hex").write_text(to_hex(qw_sep.reshape(-1), COEF_WIDTH))
     (OUT_DIR / "stage_branchB_sep_bias.hex").write_text(to_hex(qb_sep, DATA_WIDTH))
     (OUT_DIR / "stage_branchB_sep_output.hex").write_text(to_hex(sep_out, DATA_WIDTH))
@@ -49,6 +49,10 @@ COEF_WIDTH = 16
 FRAC_BITS  = 8
 ACC_WIDTH  = 48
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 F1 = 16
 T  = 600
 C  = 5
@@ -63,31 +67,26 @@ LUT_SHIFT   = 1            # codes_per_entry = 2
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)        # sign-extend
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
@@ -128,8 +127,6 @@ def main() -> int:
     # Python's >> on negative int rounds toward -inf, which matches Verilog >>> on
     # signed. We use this convention consistently in both Python and RTL.
     gap_q88   = (gap_sum * INV_N_Q24) >> 24
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     gap_q88   = np.clip(gap_q88, LO, HI).astype(np.int16)
     print(f"  GAP q88 abs_max={int(np.abs(gap_q88).max())}")
 
@@ -138,9 +135,8 @@ def main() -> int:
     gap_padded = np.zeros(F1 + 2*pad, dtype=np.int64)
     gap_padded[pad : pad + F1] = gap_q88.astype(np.int64)
 
-    acc = np.zeros(F1, dtype=np.int64)
-    for k in range(KECA):
-        acc += gap_padded[k : k + F1] * int(qw[k])
+    rows = np.arange(F1)[:, np.newaxis] + np.arange(KECA)[np.newaxis, :]
+    acc = gap_padded[rows] @ qw.astype(np.int64)         # (F1, KECA) x (KECA,)
     shifted = acc >> FRAC_BITS                          # Q8.8 result
     # Saturate
     sig_in = np.clip(shifted, LO, HI).astype(np.int16)
@@ -25,30 +25,30 @@ import numpy as np
 
 OUT_DIR    = Path("data/golden_q88")
 DATA_WIDTH = 16
+HI         = (1 << (DATA_WIDTH - 1)) - 1    # int16 saturation bounds
+LO         = -(1 << (DATA_WIDTH - 1))
 N_WIN      = 5
 N_CLS      = 2
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int32)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int32)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def main() -> int:
@@ -65,8 +65,6 @@ def main() -> int:
     print(f"final class = {cls}  ({'Right Hand fist' if cls == 0 else 'Left Leg ankle'})")
 
     # Saturate sum to int16 for the .hex artifact (output of the head module).
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     summed_sat = np.clip(summed, LO, HI).astype(np.int16)
     (OUT_DIR / "stage_final_logits_sum.hex").write_text(to_hex(summed_sat, DATA_WIDTH))
     (OUT_DIR / "stage_final_class.txt"    ).write_text(f"{cls}\n")
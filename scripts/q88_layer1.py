@@ -58,6 +58,10 @@ COEF_WIDTH = 16
 FRAC_BITS  = 8
 ACC_WIDTH  = 48
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 KE = 64
 F1 = 16
 T  = 600
@@ -65,18 +69,18 @@ C  = 5
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def make_synthetic_input(seed: int = 0xA7C) -> np.ndarray:
@@ -88,14 +92,12 @@ def make_synthetic_input(seed: int = 0xA7C) -> np.ndarray:
     """
     rng = np.random.default_rng(seed)
     t = np.arange(T) / 200.0   # seconds @ 200 Hz
-    x = np.zeros((T, C), dtype=np.float32)
     # Per-channel low-freq sines with phase offsets — different freq per chan
-    # so the 5 channels are linearly independent.
-    freqs   = [10.0, 12.0, 14.0, 16.0, 18.0]
-    phases  = [0.0, 0.7, 1.4, 2.1, 2.8]
-    amps    = [0.35, 0.4, 0.3, 0.45, 0.32]
-    for c in range(C):
-        x[:, c] = amps[c] * np.sin(2 * np.pi * freqs[c] * t + phases[c])
+    # so the 5 channels are linearly independent. Broadcast (T, 1) x (C,).
+    freqs   = np.array([10.0, 12.0, 14.0, 16.0, 18.0])
+    phases  = np.array([0.0, 0.7, 1.4, 2.1, 2.8])
+    amps    = np.array([0.35, 0.4, 0.3, 0.45, 0.32])
+    x = (amps * np.sin(2 * np.pi * freqs * t[:, np.newaxis] + phases)).astype(np.float32)
     x += 0.02 * rng.standard_normal(x.shape).astype(np.float32)
     return x
 
@@ -153,18 +155,15 @@ def main() -> int:
     qx_padded = np.zeros((T + KE - 1, C), dtype=np.int64)
     qx_padded[pad_top : pad_top + T] = qx.astype(np.int64)
 
-    acc = np.zeros((T, C, F1), dtype=np.int64)
-    for k in range(KE):
-        # qx_padded[k:k+T]    -> (T, C)
-        # qw[k]               -> (F1,)
-        acc += qx_padded[k : k + T, :, np.newaxis] * qw[k, np.newaxis, np.newaxis, :].astype(np.int64)
+    # acc[t, c, f] = sum_k qx_padded[t+k, c] * qw[k, f]; gather all KE taps
+    # of every output row at once and contract k in a single einsum.
+    rows = np.arange(T)[:, np.newaxis] + np.arange(KE)[np.newaxis, :]
+    acc = np.einsum('tkc, kf -> tcf', qx_padded[rows], qw.astype(np.int64))
 
     # Rescale to Q8.8, add folded bias, then saturate to int16.
     # The HW does:  shifted = acc >>> FRAC_BITS; with_bias = shifted + bias; out = sat(with_bias).
     shifted   = acc >> FRAC_BITS
     with_bias = shifted + qb[np.newaxis, np.newaxis, :].astype(np.int64)
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     q_out = np.clip(with_bias, LO, HI).astype(np.int16)
     n_sat = int(((with_bias > HI) | (with_bias < LO)).sum())
 
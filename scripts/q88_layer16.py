@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
 from pathlib import Path
 
 import h5py
@@ -41,6 +42,10 @@ DATA_WIDTH = 16
 COEF_WIDTH = 16
 FRAC_BITS  = 8
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 NUM_CH = 32        # post-Add feature channels
 T_IN   = 10        # post-pool2 time steps
 KECA   = 3
@@ -53,31 +58,26 @@ LUT_SHIFT   = 1
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
@@ -112,8 +112,6 @@ def main() -> int:
     # ---------- GAP via reciprocal multiply ----------
     gap_sum = x_q.astype(np.int64).sum(axis=0)          # (NUM_CH,)
     gap_q88 = (gap_sum * INV_N_Q24) >> 24
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     gap_q88 = np.clip(gap_q88, LO, HI).astype(np.int16)
     print(f"  GAP abs_max={int(np.abs(gap_q88).max())}")
 
@@ -122,9 +120,8 @@ def main() -> int:
     gap_padded = np.zeros(NUM_CH + 2*pad, dtype=np.int64)
     gap_padded[pad : pad + NUM_CH] = gap_q88.astype(np.int64)
 
-    acc = np.zeros(NUM_CH, dtype=np.int64)
-    for k in range(KECA):
-        acc += gap_padded[k : k + NUM_CH] * int(qw[k])
+    rows = np.arange(NUM_CH)[:, np.newaxis] + np.arange(KECA)[np.newaxis, :]
+    acc = gap_padded[rows] @ qw.astype(np.int64)         # (NUM_CH, KECA) x (KECA,)
     shifted = acc >> FRAC_BITS
     sig_in = np.clip(shifted, LO, HI).astype(np.int16)
     print(f"  Conv1D output abs_max={int(np.abs(sig_in).max())}")
@@ -143,7 +140,7 @@ def main() -> int:
     print(f"  gated feature map abs_max={int(np.abs(gated_q).max())} sat={n_sat}/{gated_q.size}")
 
     # ---------- Write HEX files ----------
-    (OUT_DIR / "stage_eca2_input.hex"  ).write_text((OUT_DIR / "stage_add_output.hex").read_text())
+    shutil.copyfile(OUT_DIR / "stage_add_output.hex", OUT_DIR / "stage_eca2_input.hex")
     (OUT_DIR / "stage_eca2_gap.hex"    ).write_text(to_hex(gap_q88, DATA_WIDTH))
     (OUT_DIR / "stage_eca2_weights.hex").write_text(to_hex(qw, COEF_WIDTH))
     (OUT_DIR / "stage_eca2_gate.hex"   ).write_text(to_hex(gate, DATA_WIDTH))
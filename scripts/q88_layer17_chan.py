@@ -53,6 +53,10 @@ DATA_WIDTH = 16
 COEF_WIDTH = 16
 FRAC_BITS  = 8
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 T_FULL  = 10
 NUM_CH  = 32
 T_WIN   = 6
@@ -65,31 +69,26 @@ LUT_SHIFT   = 1
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
@@ -107,8 +106,6 @@ def dense_q88(x_q: np.ndarray, w_q: np.ndarray, b_q: np.ndarray) -> np.ndarray:
     acc = x_q.astype(np.int64) @ w_q.astype(np.int64)
     shifted = acc >> FRAC_BITS
     with_bias = shifted + b_q.astype(np.int64)
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     return np.clip(with_bias, LO, HI).astype(np.int16)
 
 
@@ -145,8 +142,6 @@ def main() -> int:
     print(f"  window {w} slice [{w}:{w+T_WIN}] shape={win.shape} abs_max={int(np.abs(win).max())}")
 
     # ---------- Avg / Max GAP over T_WIN ----------
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     avg_sum = win.astype(np.int64).sum(axis=0)                        # (32,)
     avg_gap = (avg_sum * INV_N_Q24) >> 24
     avg_gap = np.clip(avg_gap, LO, HI).astype(np.int16)
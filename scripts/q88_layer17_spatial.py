@@ -55,6 +55,10 @@ DATA_WIDTH = 16
 COEF_WIDTH = 16
 FRAC_BITS  = 8
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 T_WIN  = 6
 NUM_CH = 32
 KH     = 7
@@ -68,31 +72,26 @@ LUT_SHIFT   = 1
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
@@ -120,8 +119,6 @@ def main() -> int:
     x_q = load_q88_hex(in_hex_path, (T_WIN, NUM_CH))                  # (6, 32)
     print(f"  input shape={x_q.shape} abs_max={int(np.abs(x_q).max())}")
 
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
 
     # ---------- Avg pool over channels (32) ----------
     avg_sum = x_q.astype(np.int64).sum(axis=1)                        # (6,)
@@ -174,20 +171,18 @@ def main() -> int:
     # We only need the kw=pad_w column of the kernel because input W=1.
     # qw[:, pad_w, :] has shape (7, 3): per-tap weight across 3 input channels.
     qw_slice = qw[:, pad_w, :]                                          # (7, 3) signed
-    HI64 = HI; LO64 = LO
 
     # Pad concat to length (T_WIN + KH - 1) in T-axis with zeros.
     cat_pad = np.zeros((T_WIN + KH - 1, IC_CAT), dtype=np.int64)
     cat_pad[pad_h : pad_h + T_WIN, :] = concat.astype(np.int64)
 
     # acc[t] = sum_{kh,ic} cat_pad[t+kh, ic] * qw_slice[kh, ic]
-    acc = np.zeros(T_WIN, dtype=np.int64)
-    for kh in range(KH):
-        acc += (cat_pad[kh : kh + T_WIN, :] * qw_slice[kh][np.newaxis, :].astype(np.int64)).sum(axis=1)
+    rows = np.arange(T_WIN)[:, np.newaxis] + np.arange(KH)[np.newaxis, :]
+    acc  = np.einsum('tki, ki -> t', cat_pad[rows], qw_slice.astype(np.int64))   # (6,)
     shifted   = acc >> FRAC_BITS
-    sig_in    = np.clip(shifted, LO64, HI64).astype(np.int16)            # (6,)
+    sig_in    = np.clip(shifted, LO, HI).astype(np.int16)                # (6,)
     print(f"  pre-sigmoid abs_max={int(np.abs(sig_in).max())} sat="
-          f"{int(((shifted > HI64) | (shifted < LO64)).sum())}/{shifted.size}")
+          f"{int(((shifted > HI) | (shifted < LO)).sum())}/{shifted.size}")
 
     # ---------- Sigmoid LUT ----------
     lut = load_q88_hex(LUT_FILE, (LUT_N,))
@@ -37,6 +37,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
 from pathlib import Path
 
 import h5py
@@ -52,6 +53,10 @@ COEF_WIDTH = 16
 FRAC_BITS  = 8
 ACC_WIDTH  = 48
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 # Branch A (D=2) parameters
 T  = 600
 C  = 5
@@ -61,31 +66,26 @@ F2 = F1 * D            # 32 output channels
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
@@ -129,8 +129,6 @@ def main() -> int:
     qb = quantize_q88(bias)                                          # (F1, D) int16
 
     # ---------- Q8.8 depthwise: per output channel i=f*D+d ----------
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
 
     # acc[t, f, d] = sum_c x[t,c,f] * w_folded[c,f,d]
     # Use einsum for clarity: t c f, c f d -> t f d
@@ -152,7 +150,7 @@ def main() -> int:
     # w_folded[c, f, d] for all i = f*D + d.  Linearize as:
     #     address = c * F2 + i        (c slow, i fast)
     # so the HW reads 32 contiguous weights per (electrode) cycle.
-    qw_flat = qw.transpose(0, 1, 2).reshape(C, F2)                  # (C, F2) since i=f*D+d
+    qw_flat = qw.reshape(C, F2)                                     # (C, F2) since i=f*D+d
     bias_flat = qb.reshape(F2)                                       # (F2,)
 
     in_hex   = OUT_DIR / "stage_branchA_dwise_input.hex"     # symlink-like; matches stage_eca1_output.hex
@@ -161,7 +159,7 @@ def main() -> int:
     out_hex  = OUT_DIR / "stage_branchA_dwise_output.hex"
     # Reuse the eca1 output as input (don't duplicate the 48k-line file)
     # but ALSO write a symlink-friendly copy so the TB can $readmemh from a stable path.
-    in_hex.write_text(Path(ECA1_OUT_HEX).read_text())
+    shutil.copyfile(ECA1_OUT_HEX, in_hex)
     w_hex.write_text(to_hex(qw_flat, COEF_WIDTH))
     bias_hex.write_text(to_hex(bias_flat, DATA_WIDTH))
     out_hex.write_text(to_hex(q_out_flat, DATA_WIDTH))
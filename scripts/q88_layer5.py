@@ -33,6 +33,8 @@ OUT_DIR       = Path("data/golden_q88")
 
 DATA_WIDTH = 16
 FRAC_BITS  = 8
+HI         = (1 << (DATA_WIDTH - 1)) - 1    # int16 saturation bounds
+LO         = -(1 << (DATA_WIDTH - 1))
 
 T  = 600
 F2 = 32
@@ -45,36 +47,32 @@ LUT_SHIFT   = 3         # codes_per_entry = 8
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
 
 def elu_q88_lut(x_q88: np.ndarray, lut: np.ndarray) -> np.ndarray:
     """Match the RTL ELU lookup exactly: bypass for x>=0; LUT for x<0."""
-    out = x_q88.copy().astype(np.int32)
+    out = x_q88.astype(np.int32)
     neg_mask = x_q88 < 0
     neg_vals = x_q88[neg_mask]
     addr = ((-neg_vals.astype(np.int64)) >> LUT_SHIFT).astype(np.int64)
     addr = np.clip(addr, 0, LUT_N - 1)
     out[neg_mask] = lut[addr]
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     return np.clip(out, LO, HI).astype(np.int16)
 
 
@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
 from pathlib import Path
 
 import numpy as np
@@ -36,6 +37,8 @@ OUT_DIR     = Path("data/golden_q88")
 
 DATA_WIDTH = 16
 FRAC_BITS  = 8
+HI         = (1 << (DATA_WIDTH - 1)) - 1    # int16 saturation bounds
+LO         = -(1 << (DATA_WIDTH - 1))
 
 T          = 600
 F2         = 32
@@ -49,25 +52,23 @@ INV_POOL_Q  = round((1 << Q_SHIFT) / POOL)   # 2097152 for POOL=8 (= 2^24 / 8)
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def main() -> int:
@@ -87,15 +88,13 @@ def main() -> int:
     # Reciprocal-multiply: y = (sum * INV_POOL_Q) >> Q_SHIFT
     prod    = sums * INV_POOL_Q
     y       = prod >> Q_SHIFT
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     y_q     = np.clip(y, LO, HI).astype(np.int16)
     n_sat   = int(((y > HI) | (y < LO)).sum())
     print(f"  output shape={y_q.shape}, abs_max={int(np.abs(y_q).max())}, sat={n_sat}/{y_q.size}")
 
     in_hex  = OUT_DIR / "stage_branchA_pool1_input.hex"
     out_hex = OUT_DIR / "stage_branchA_pool1_output.hex"
-    in_hex.write_text(Path(ELU_OUT_HEX).read_text())
+    shutil.copyfile(ELU_OUT_HEX, in_hex)
     out_hex.write_text(to_hex(y_q, DATA_WIDTH))
     print()
     print(f"wrote {in_hex}   ({x_q.size} values, copy of ELU output)")
@@ -39,6 +39,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
 from pathlib import Path
 
 import h5py
@@ -54,37 +55,36 @@ COEF_WIDTH = 16
 FRAC_BITS  = 8
 ACC_WIDTH  = 48
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 T_POOL = 75
 F2     = 32
 KE     = 16
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
@@ -132,17 +132,13 @@ def main() -> int:
     x_padded = np.zeros((T_POOL + KE - 1, F2), dtype=np.int64)
     x_padded[pad_top : pad_top + T_POOL] = x_q.astype(np.int64)
 
-    acc = np.zeros((T_POOL, F2), dtype=np.int64)
     # acc[t, f_out] = sum_k sum_f_in x_padded[k+t, f_in] * qw[k, f_in, f_out]
-    for k in range(KE):
-        acc += np.einsum('ti, ij -> tj',
-                         x_padded[k : k + T_POOL].astype(np.int64),
-                         qw[k].astype(np.int64))
+    # Gather every window once, then contract (k, f_in) in a single call.
+    rows = np.arange(T_POOL)[:, np.newaxis] + np.arange(KE)[np.newaxis, :]
+    acc = np.tensordot(x_padded[rows], qw.astype(np.int64), axes=([1, 2], [0, 1]))
 
     shifted   = acc >> FRAC_BITS
     with_bias = shifted + qb[np.newaxis, :].astype(np.int64)
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     q_out = np.clip(with_bias, LO, HI).astype(np.int16)
     n_sat = int(((with_bias > HI) | (with_bias < LO)).sum())
     print(f"  output shape={q_out.shape}, abs_max={int(np.abs(q_out).max())}, sat={n_sat}/{q_out.size}")
@@ -157,7 +153,7 @@ def main() -> int:
     w_hex    = OUT_DIR / "stage_branchA_sep_weights.hex"
     bias_hex = OUT_DIR / "stage_branchA_sep_bias.hex"
     out_hex  = OUT_DIR / "stage_branchA_sep_output.hex"
-    in_hex.write_text(Path(INPUT_HEX).read_text())
+    shutil.copyfile(INPUT_HEX, in_hex)
     w_hex.write_text(to_hex(qw_flat, COEF_WIDTH))
     bias_hex.write_text(to_hex(bias_flat, DATA_WIDTH))
     out_hex.write_text(to_hex(q_out, DATA_WIDTH))
@@ -19,6 +19,7 @@ Layer 9 reciprocal-multiply: POOL=7, Q_SHIFT=24, INV_POOL_Q = round(2^24/7) = 23
 from __future__ import annotations
 
 import json
+import shutil
 from pathlib import Path
 
 import numpy as np
@@ -30,6 +31,8 @@ OUT_DIR         = Path("data/golden_q88")
 
 DATA_WIDTH = 16
 FRAC_BITS  = 8
+HI         = (1 << (DATA_WIDTH - 1)) - 1    # int16 saturation bounds
+LO         = -(1 << (DATA_WIDTH - 1))
 
 T_POOL   = 75
 F2       = 32
@@ -46,36 +49,32 @@ LUT_SHIFT   = 3
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def elu_q88_lut(x_q88: np.ndarray, lut: np.ndarray) -> np.ndarray:
-    out = x_q88.copy().astype(np.int32)
+    out = x_q88.astype(np.int32)
     neg_mask = x_q88 < 0
     neg_vals = x_q88[neg_mask]
     addr = ((-neg_vals.astype(np.int64)) >> LUT_SHIFT).astype(np.int64)
     addr = np.clip(addr, 0, LUT_N - 1)
     out[neg_mask] = lut[addr]
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     return np.clip(out, LO, HI).astype(np.int16)
 
 
@@ -93,7 +92,7 @@ def main() -> int:
 
     l8_in_hex  = OUT_DIR / "stage_branchA_sep_elu_input.hex"
     l8_out_hex = OUT_DIR / "stage_branchA_sep_elu_output.hex"
-    l8_in_hex.write_text(Path(SEP_OUT_HEX).read_text())
+    shutil.copyfile(SEP_OUT_HEX, l8_in_hex)
     l8_out_hex.write_text(to_hex(sep_elu, DATA_WIDTH))
     print(f"  wrote {l8_in_hex}    ({sep.size} values)")
     print(f"  wrote {l8_out_hex}   ({sep_elu.size} values)")
@@ -106,8 +105,6 @@ def main() -> int:
     sums    = grouped.sum(axis=1)
     prod    = sums * INV_POOL_Q
     y       = prod >> Q_SHIFT
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     y_q     = np.clip(y, LO, HI).astype(np.int16)
     n_sat   = int(((y > HI) | (y < LO)).sum())
     print(f"  output shape={y_q.shape}, abs_max={int(np.abs(y_q).max())}, sat={n_sat}/{y_q.size}")
@@ -47,6 +47,10 @@ DATA_WIDTH = 16
 COEF_WIDTH = 16
 FRAC_BITS  = 8
 
+SCALE = 1 << FRAC_BITS                    # Q8.8: 1.0 == 256
+HI    = (1 << (DATA_WIDTH - 1)) - 1       # int16 saturation bounds
+LO    = -(1 << (DATA_WIDTH - 1))
+
 T_WIN  = 6
 F      = 32
 K      = 4
@@ -58,44 +62,37 @@ LUT_SHIFT   = 3
 
 
 def quantize_q88(arr: np.ndarray) -> np.ndarray:
-    scale = 1 << FRAC_BITS
-    hi = (1 << (DATA_WIDTH - 1)) - 1
-    lo = -(1 << (DATA_WIDTH - 1))
-    q = np.round(arr * scale).astype(np.int64)
-    return np.clip(q, lo, hi).astype(np.int16)
+    q = np.round(arr * SCALE).astype(np.int64)
+    return np.clip(q, LO, HI).astype(np.int16)
 
 
 def to_hex(q: np.ndarray, width: int = 16) -> str:
     mask = (1 << width) - 1
+    flat = (q.astype(np.int64) & mask).ravel()
+    if width == 16:
+        # bytes.hex() does the formatting in C: 2 big-endian bytes -> 4 digits per line.
+        return flat.astype(">u2").tobytes().hex("\n", 2).upper() + "\n"
     digits = (width + 3) // 4
-    flat = q.flatten()
-    return "\n".join(f"{int(v) & mask:0{digits}X}" for v in flat) + "\n"
+    return "\n".join(f"{v:0{digits}X}" for v in flat.tolist()) + "\n"
 
 
 def load_q88_hex(path: str, shape: tuple) -> np.ndarray:
-    flat = []
     with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            v = int(line, 16)
-            if v >= (1 << (DATA_WIDTH - 1)):
-                v -= (1 << DATA_WIDTH)
-            flat.append(v)
-    a = np.array(flat, dtype=np.int16)
+        words = f.read().split()
+    # One 4-digit word per line: decode them all at once as big-endian int16.
+    assert set(map(len, words)) <= {4}, f"expected 4-digit hex words in {path}"
+    a = np.frombuffer(bytes.fromhex("".join(words)), dtype=">i2").astype(np.int16)
     assert a.size == np.prod(shape), f"hex size {a.size} != expected {np.prod(shape)} for {path}"
     return a.reshape(shape)
 
 
 def elu_q88_lut(x_q88: np.ndarray, lut: np.ndarray) -> np.ndarray:
-    out = x_q88.copy().astype(np.int32)
+    out = x_q88.astype(np.int32)
     neg_mask = x_q88 < 0
     neg_vals = x_q88[neg_mask]
     addr = ((-neg_vals.astype(np.int64)) >> LUT_SHIFT).astype(np.int64)
     addr = np.clip(addr, 0, LUT_N - 1)
     out[neg_mask] = lut[addr]
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     return np.clip(out, LO, HI).astype(np.int16)
 
 
@@ -104,31 +101,21 @@ def causal_conv1d_q88(x_q: np.ndarray,
                       qb_folded: np.ndarray,
                       dilation: int) -> np.ndarray:
     """x_q (T, F_in); qw_folded (K, F_in, F_out); qb_folded (F_out,).
-       Causal padding: left pad with (K-1)*dilation zeros, no right pad.
+       Causal padding: (K-1)*dilation zeros on the left, no right pad. The
+       padding is virtual — taps that land before t=0 are masked to zero.
        Output shape (T, F_out)."""
-    T_in, F_in = x_q.shape
-    F_out = qw_folded.shape[2]
-    pad_left = (K - 1) * dilation
-    xp = np.zeros((T_in + pad_left, F_in), dtype=np.int64)
-    xp[pad_left:] = x_q.astype(np.int64)
-    acc = np.zeros((T_in, F_out), dtype=np.int64)
-    for k in range(K):
-        # tap k corresponds to lookback (K-1-k)*dilation from output t
-        offset = pad_left - k * dilation   # = (K-1-k)*dilation
-        seg = xp[offset : offset + T_in]    # shape (T_in, F_in)
-        acc += np.einsum('ti, ij -> tj',
-                         seg.astype(np.int64),
-                         qw_folded[k].astype(np.int64))
+    T_in = x_q.shape[0]
+    # Gather all taps at once: tap k of output t reads x[t - k*dilation].
+    src = np.arange(T_in)[:, np.newaxis] - np.arange(K)[np.newaxis, :] * dilation
+    win = x_q[np.maximum(src, 0)].astype(np.int64)   # (T_in, K, F_in)
+    win *= (src >= 0)[:, :, np.newaxis]
+    acc = np.einsum('tki, kij -> tj', win, qw_folded.astype(np.int64))
     shifted   = acc >> FRAC_BITS
     with_bias = shifted + qb_folded[np.newaxis, :].astype(np.int64)
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     return np.clip(with_bias, LO, HI).astype(np.int16)
 
 
 def sat_add_q88(a: np.ndarray, b: np.ndarray) -> np.ndarray:
-    HI = (1 << (DATA_WIDTH - 1)) - 1
-    LO = -(1 << (DATA_WIDTH - 1))
     s = a.astype(np.int64) + b.astype(np.int64)
     return np.clip(s, LO, HI).astype(np.int16)
 
@@ -11,9 +11,13 @@ Example:
 """
 
 import argparse
+import re
 import struct
 import sys
 
+# $readmemh line comments; stripped from the whole file in one pass.
+COMMENT_RE = re.compile(r"//[^\n]*")
+
 
 def main():
     ap = argparse.ArgumentParser(description=__doc__,
@@ -25,29 +29,21 @@ def main():
                     help="Expected number of 16-bit samples (default 3000)")
     args = ap.parse_args()
 
-    samples = []
     with open(args.hexfile) as f:
-        for line in f:
-            tok = line.strip().split("//")[0].strip()
-            if not tok:
-                continue
-            # Treat as hex; convert to signed 16-bit
-            v = int(tok, 16)
-            if v >= 0x8000:
-                v -= 0x10000
-            samples.append(v)
+        tokens = COMMENT_RE.sub("", f.read()).split()
+
+    # Keep the raw 16-bit two's-complement patterns: packing them unsigned
+    # ("H") yields the same bytes as sign-extending and packing as int16.
+    samples = [int(tok, 16) for tok in tokens]
 
     if len(samples) != args.samples:
         print(f"[hex_to_window] WARNING: got {len(samples)} samples, "
               f"expected {args.samples}", file=sys.stderr)
 
     # Truncate or pad to exact length
-    if len(samples) > args.samples:
-        samples = samples[:args.samples]
-    while len(samples) < args.samples:
-        samples.append(0)
+    samples = samples[:args.samples] + [0] * (args.samples - len(samples))
 
-    packed = struct.pack(f"<{args.samples}h", *samples)
+    packed = struct.pack(f"<{args.samples}H", *samples)
     if args.out == "-":
         sys.stdout.buffer.write(packed)
     else: